@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import Any, Union
+from typing import Any, Optional, Union
 
 from subtypes import Enum
 
@@ -16,7 +16,14 @@ class Enums:
         ASCENDING = DESCENDING = Enum.Auto()
 
 
+Enums.Operator.EQUAL.truth, Enums.Operator.UNEQUAL.truth = True, False
+Enums.Operator.GREATER.name_attr, Enums.Operator.LESS.name_attr = "greater", "less"
+Enums.ChainOperator.AND.parentheses, Enums.ChainOperator.OR.parentheses = ("(", ")"), ("{", "}")
+
+
 class ComparableName:
+    __slots__ = ("name", "less", "greater")
+
     def __init__(self, name: str, less: str, greater: str) -> None:
         self.name, self.less, self.greater = name, less, greater
 
@@ -29,18 +36,28 @@ class BaseAttributeMeta(type):
 
     name: str
 
+    def __new__(mcs, name: str, bases: tuple, attributes: dict) -> Any:
+        attributes.setdefault("__slots__", ())
+        return super().__new__(mcs, name, bases, attributes)
+
     def __hash__(cls) -> int:
         return id(cls)
 
     def __and__(cls, other: Any) -> Expression:
-        return Expression(left=cls, operator=Enums.ChainOperator.AND, right=other)
+        return Expression.build(left=cls, operator=Enums.ChainOperator.AND, right=other)
 
     def __or__(cls, other: Any) -> Expression:
-        return Expression(left=cls, operator=Enums.ChainOperator.OR, right=other)
+        return Expression.build(left=cls, operator=Enums.ChainOperator.OR, right=other)
 
     def _resolve(cls) -> Any:
         raise ValueError(f"Cannot resolve an object of type '{cls.__name__}' without using it as part of a boolean expression.")
 
+    def _check_value(cls, value: Any) -> Any:
+        if value is None:
+            raise ValueError(f"Cannot filter {cls.name} by {None}.")
+
+        return value
+
 
 class BooleanAttributeMeta(BaseAttributeMeta):
     """A metaclass for boolean attributes which allows them to be automatically resolved to a True boolean expression, or inverted ('~' operator) for a False one."""
@@ -60,7 +77,7 @@ class EnumerableAttributeMeta(BaseAttributeMeta):
             if isinstance(val, BooleanAttributeMeta):
                 val.owner = attributes["name"]
 
-        return type.__new__(mcs, name, bases, attributes)
+        return super().__new__(mcs, name, bases, attributes)
 
 
 class EquatableAttributeMeta(BaseAttributeMeta):
@@ -70,44 +87,51 @@ class EquatableAttributeMeta(BaseAttributeMeta):
         return id(cls)
 
     def __eq__(cls, other: Any) -> EquatableAttribute:
-        return cls(operator=Enums.Operator.EQUAL, value=other)
+        return cls(operator=Enums.Operator.EQUAL, value=cls._check_value(other))
 
     def __ne__(cls, other: Any) -> EquatableAttribute:
-        return cls(operator=Enums.Operator.UNEQUAL, value=other)
+        return cls(operator=Enums.Operator.UNEQUAL, value=cls._check_value(other))
 
 
 class ComparableAttributeMeta(BaseAttributeMeta):
     """A metaclass for comparable attributes."""
 
     def __gt__(cls, other: Any) -> ComparableAttribute:
-        return cls(operator=Enums.Operator.GREATER, value=other)
+        return cls(operator=Enums.Operator.GREATER, value=cls._check_value(other))
 
     def __lt__(cls, other: Any) -> ComparableAttribute:
-        return cls(operator=Enums.Operator.LESS, value=other)
+        return cls(operator=Enums.Operator.LESS, value=cls._check_value(other))
 
 
 class BaseAttribute:
-    """An abstract base class for all attributes to inherit from, providing basic functionality."""
+    """An abstract base class for all attributes to inherit from, providing basic functionality. Subclasses are given empty '__slots__' by their metaclass, so instances never carry a '__dict__'."""
+    __slots__ = ("value", "operator", "direction", "negated", "_str_cache")
     name: Union[str, ComparableName]
 
     def __init__(self, value: Any = None, operator: Enums.Operator = None, direction: Enums.Direction = None) -> None:
         self.value, self.operator, self.direction, self.negated = value, operator, direction, False
+        self._str_cache: Optional[str] = None
 
     def __repr__(self) -> str:
         return str(self)
 
     def __str__(self) -> str:
-        return f"""{self._prefix()}{self._left()}:{self._right()}"""
+        if (string := self._str_cache) is None:
+            string = self._str_cache = f"""{self._prefix()}{self._left()}:{self._right()}"""
+
+        return string
 
     def __and__(self, other: Union[BaseAttribute, Expression]) -> Expression:
-        return Expression(left=self, operator=Enums.ChainOperator.AND, right=other)
+        return Expression.build(left=self, operator=Enums.ChainOperator.AND, right=other)
 
     def __or__(self, other: Union[BaseAttribute, Expression]) -> Expression:
-        return Expression(left=self, operator=Enums.ChainOperator.OR, right=other)
+        return Expression.build(left=self, operator=Enums.ChainOperator.OR, right=other)
 
     def __invert__(self) -> BaseAttribute:
-        self.negated = not self.negated
-        return self
+        """Return a negated copy of this attribute, leaving it unchanged so that any expression it is already part of is unaffected."""
+        inverted = object.__new__(type(self))
+        inverted.value, inverted.operator, inverted.direction, inverted.negated, inverted._str_cache = self.value, self.operator, self.direction, not self.negated, None
+        return inverted
 
     def _prefix(self) -> str:
         negated = not self.negated if self.operator is Enums.Operator.UNEQUAL else self.negated
@@ -125,13 +149,7 @@ class BooleanAttribute(BaseAttribute, metaclass=BooleanAttributeMeta):
     owner: str
 
     def _prefix(self) -> str:
-        truth = Enums.Operator[self.operator].map_to({
-            Enums.Operator.EQUAL: True,
-            Enums.Operator.UNEQUAL: False,
-        })
-
-        truth = not truth if self.negated else truth
-        return '' if truth else '-'
+        return '' if self.operator.truth ^ self.negated else '-'
 
     def _left(self) -> str:
         return self.owner
@@ -161,10 +179,7 @@ class ComparableAttribute(BaseAttribute, metaclass=ComparableAttributeMeta):
     """A class for attributes to inherit from which can be queried with '>' and '<'."""
 
     def _left(self) -> str:
-        return Enums.Operator[self.operator].map_to({
-            Enums.Operator.GREATER: self.name.greater,
-            Enums.Operator.LESS: self.name.less,
-        })
+        return getattr(self.name, self.operator.name_attr)
 
     def _right(self) -> str:
         return self._coerce(self.value)
@@ -175,6 +190,7 @@ class ComparableAttribute(BaseAttribute, metaclass=ComparableAttributeMeta):
 
 class OrderableAttributeMixin:
     """A mixin class for attributes to inherit from which maps to an attribute of Message objects, for use in order_by clauses."""
+    __slots__ = ()
 
     attr: str
 
@@ -191,41 +207,55 @@ class OrderableAttributeMixin:
 
 
 class Expression:
-    """A class representing a binary clause of where each side contains either an instanciated attribute or another expression."""
+    """A class representing a clause joining any number of operands with a single operator, where each operand is either an instanciated attribute or another expression."""
 
-    parentheses = {
-        Enums.ChainOperator.AND: ("(", ")"),
-        Enums.ChainOperator.OR: ("{", "}")
-    }
+    __slots__ = ("operator", "operands", "negated", "_str_cache")
 
-    def __init__(self, left: Union[BaseAttributeMeta, BaseAttribute, Expression], operator: Enums.ChainOperator, right: Union[BaseAttributeMeta, BaseAttribute, Expression]) -> None:
-        self.left, self.right = left._resolve() if isinstance(left, BaseAttributeMeta) else left, right._resolve() if isinstance(right, BaseAttributeMeta) else right
-        self.operator, self.negated = operator, False
-
-        for side in (self.left, self.right):
-            if isinstance(side, BaseAttribute):
-                if side.value is None:
-                    raise ValueError(f"Cannot filter {side.name} by {None}.")
-                if side.operator is None:
-                    raise ValueError(f"Cannot filter {side.name} without a logical operator.")
+    def __init__(self, operator: Enums.ChainOperator, operands: list[Union[BaseAttribute, Expression]]) -> None:
+        self.operator, self.operands, self.negated = operator, operands, False
+        self._str_cache: Optional[str] = None
 
     def __repr__(self) -> str:
         return str(self)
 
     def __str__(self) -> str:
-        open_paren, close_paren = self.parentheses[self.operator]
-        return f"""{'-' if self.negated else ''}{open_paren}{self.left} {self.right}{close_paren}"""
+        if (string := self._str_cache) is None:
+            open_paren, close_paren = self.operator.parentheses
+            string = self._str_cache = f"""{'-' if self.negated else ''}{open_paren}{' '.join(map(str, self.operands))}{close_paren}"""
+
+        return string
 
     def __and__(self, other: Union[BaseAttribute, Expression]) -> Expression:
-        return Expression(left=self, operator=Enums.ChainOperator.AND, right=other)
+        return Expression.build(left=self, operator=Enums.ChainOperator.AND, right=other)
 
     def __or__(self, other: Union[BaseAttribute, Expression]) -> Expression:
-        return Expression(left=self, operator=Enums.ChainOperator.OR, right=other)
+        return Expression.build(left=self, operator=Enums.ChainOperator.OR, right=other)
 
     def __invert__(self) -> Expression:
         return self._negate()
 
     def _negate(self) -> Expression:
-        """Negate this boolean expression by either using the logically oposite operator, or, if none exists, using the 'not' logical operator."""
-        self.negated = not self.negated
-        return self
+        """Return a negated copy of this boolean expression, leaving it unchanged so that any expression it is already part of is unaffected."""
+        negated = type(self)(operator=self.operator, operands=self.operands)
+        negated.negated = not self.negated
+        return negated
+
+    @classmethod
+    def build(cls, left: Union[BaseAttributeMeta, BaseAttribute, Expression], operator: Enums.ChainOperator, right: Union[BaseAttributeMeta, BaseAttribute, Expression]) -> Expression:
+        """Join the two sides with the given operator. A side that is itself a non-negated expression using the same operator has its operands spliced in rather than being nested, so chains like 'a & b & c' produce a single flat expression."""
+        operands = []
+
+        for side in (left, right):
+            if isinstance(side, BaseAttributeMeta):
+                side = side._resolve()
+
+            if isinstance(side, Expression) and side.operator is operator and not side.negated:
+                operands += side.operands
+                continue
+
+            if isinstance(side, BaseAttribute) and side.direction is not None:
+                raise ValueError(f"Cannot filter by {side.name}, which was created for an order_by clause rather than compared to a value.")
+
+            operands.append(side)
+
+        return cls(operator=operator, operands=operands)
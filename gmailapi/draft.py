@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import os
+from base64 import urlsafe_b64encode
+from email.generator import BytesGenerator
+from io import BytesIO
 from typing import Union, Collection, TYPE_CHECKING, Optional
 from html import escape, unescape
 
@@ -8,7 +11,8 @@ import emails
 
 from subtypes import Html, Str
 from pathmagic import File, PathLike
-from miscutils import OneOrMany, Base64
+
+from .utils import as_list
 
 if TYPE_CHECKING:
     from .gmail import Gmail
@@ -60,12 +64,12 @@ class MessageDraft:
 
     def attach(self, attachments: Union[PathLike, Collection[PathLike]]) -> MessageDraft:
         """Attach a file or a collection of files to this message."""
-        self._attachments += [File.from_pathlike(file) for file in OneOrMany(of_type=(str, os.PathLike)).to_list(attachments)]
+        self._attachments += [File.from_pathlike(file) for file in as_list(attachments, of_type=(str, os.PathLike))]
         return self
 
     def send(self) -> bool:
         """Send this message as it currently is."""
-        message_id = self.gmail.service.users().messages().send(userId="me", body=self._prepare_message_body()).execute()["id"]
+        message_id = self.gmail._messages.send(userId="me", body=self._prepare_message_body()).execute()["id"]
         return self.gmail.Constructors.Message.from_id(message_id=message_id, gmail=self.gmail)
 
     def _prepare_message_body(self) -> dict:
@@ -85,7 +89,9 @@ class MessageDraft:
         for attachment in self._attachments:
             msg.attach(filename=attachment.name, data=attachment.path.read_bytes())
 
-        body = {"raw": Base64(raw_bytes=msg.build_message().as_bytes()).to_b64()}
+        mime, buffer = msg.build_message(), BytesIO()
+        BytesGenerator(buffer, mangle_from_=False, policy=mime.policy).flatten(mime)
+        body = {"raw": urlsafe_b64encode(buffer.getbuffer()).decode("ascii")}
 
         if self.parent is not None:
             body["threadId"] = self.parent.thread_id
@@ -93,7 +99,7 @@ class MessageDraft:
         return body
 
     def _parse_contacts(self, contacts: Union[str, Collection[str]]) -> list[str]:
-        return [str(contact) for contact in OneOrMany(of_type=(self.gmail.Constructors.Contact, str)).to_list(contacts)]
+        return [str(contact) for contact in as_list(contacts, of_type=(self.gmail.Constructors.Contact, str))]
 
     def _html_to_plaintext(self, html: str) -> str:
         markup = Html(unescape(self._html.replace("<br>", "\n")))
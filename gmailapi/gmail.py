@@ -1,19 +1,73 @@
 from __future__ import annotations
 
+import json
+import threading
+import time
 import webbrowser
+from functools import lru_cache
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Collection, Iterable, Optional, Union
 
-from googleapiclient.discovery import build
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
+from googleapiclient.errors import HttpError
+from googleapiclient.http import HttpRequest, build_http
+from googleapiclient.model import JsonModel
+from google.oauth2.credentials import Credentials
+from google_auth_httplib2 import AuthorizedHttp
 
 from pathmagic import File
-from iotools import Config, Gui, Widget
 
 from .label import BaseLabel, Label, UserLabel, SystemLabel, Category, LabelAccessor
 from .message import Message, MessageDraft, Contact, Body, Attachments, Attachment
+from .utils import as_list
 from .query import Query
 import gmailapi
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+@lru_cache(maxsize=None)
+def _discovery_document() -> dict:
+    """Load the gmail discovery document bundled with googleapiclient, rather than fetching it over the network. It is only parsed once per process."""
+    from googleapiclient.discovery_cache import get_static_doc
+    return json.loads(get_static_doc("gmail", "v1"))
+
+
+class _JsonModel(JsonModel):
+    """The model used to deserialize api responses. Parses them with orjson when it is installed, which is considerably faster than the stdlib json module on large raw-format messages."""
+
+    def deserialize(self, content: Union[str, bytes]) -> Any:
+        if orjson is None:
+            return super().deserialize(content)
+
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            return content.decode("utf-8") if isinstance(content, bytes) else content
+
+        return body["data"] if self._data_wrapper and isinstance(body, dict) and "data" in body else body
+
+
+class _BatchCollector:
+    """The callback of a batch request. Collects the responses in the order the requests were added, along with the indices of any requests that should be retried after being rate limited."""
+    __slots__ = ("responses", "rate_limited", "retry")
+
+    def __init__(self, size: int) -> None:
+        self.responses: list[Optional[dict]] = [None] * size
+        self.rate_limited: list[int] = []
+        self.retry = True
+
+    def __call__(self, request_id: str, response: dict, exception: Exception) -> None:
+        if exception is None:
+            self.responses[int(request_id)] = response
+        elif self.retry and Gmail._is_rate_limit_error(exception):
+            self.rate_limited.append(int(request_id))
+        else:
+            raise exception
+
 
 class Gmail:
     class Constructors:
@@ -22,10 +76,15 @@ class Gmail:
         Contact, Body, Attachments, Attachment = Contact, Body, Attachments, Attachment
 
     BATCH_SIZE = 100
-    BATCH_DELAY_SECONDS = 1
+    BATCH_DELAY_SECONDS = 0
+    BATCH_WORKERS = 4
+    BATCH_BACKOFF_SECONDS = 1
+    BATCH_MAX_RETRIES = 5
+    BATCH_MODIFY_SIZE = 1000
+    PROFILE_CACHE_SECONDS = 24*60*60
 
-    DEFAULT_SCOPES = ["https://mail.google.com/"]
-    ALL_SCOPES = [
+    DEFAULT_SCOPES = ("https://mail.google.com/",)
+    ALL_SCOPES = (
         "https://www.googleapis.com/auth/gmail.labels",
         "https://www.googleapis.com/auth/gmail.send",
         "https://www.googleapis.com/auth/gmail.readonly",
@@ -36,26 +95,46 @@ class Gmail:
         "https://www.googleapis.com/auth/gmail.settings.basic",
         "https://www.googleapis.com/auth/gmail.settings.sharing",
         "https://mail.google.com/",
-    ]
+    )
 
     def __init__(self) -> None:
+        from googleapiclient.discovery import build_from_document
+        from iotools import Config
+
         self.config = Config(name=gmailapi.__name__)
+        self._local, self._lock = threading.local(), threading.Lock()
+        self._backoff, self._next_batch_not_before = 0, time.monotonic()
 
-        self.token = self.config.dir.new_dir("tokens").new_file("token", "pkl")
-        self.credentials = self.token.read()
+        self.token = self.config.dir.new_dir("tokens").new_file("token", "json")
+        self._written_token: Optional[str] = None
+        self.credentials = self._read_token()
         self._ensure_credentials_are_valid()
+        self._write_token()
 
-        self.service = build("gmail", "v1", credentials=self.credentials)
-        self.address = self.service.users().getProfile(userId="me").execute()["emailAddress"]
+        self.service = build_from_document(_discovery_document(), http=self._http, model=_JsonModel(), requestBuilder=self._build_request)
+        self._messages = self.service.users().messages()
+        self.address = self._read_address()
 
         self.labels = LabelAccessor(gmail=self)
 
+        self._executor = ThreadPoolExecutor(max_workers=self.BATCH_WORKERS, thread_name_prefix=type(self).__name__)
+
     def __repr__(self) -> str:
         return f"{type(self).__name__}(address={repr(self.address)})"
 
     def __getitem__(self, val: str) -> BaseLabel:
         return self.label_from_name(val)
 
+    def __enter__(self) -> Gmail:
+        return self
+
+    def __exit__(self, ex_type: Any, ex_value: Any, ex_traceback: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the thread pool used to fetch query results, waiting for any batches already submitted to it."""
+        self._executor.shutdown(wait=True)
+
     @property
     def draft(self) -> MessageDraft:
         return self.Constructors.MessageDraft(gmail=self)
@@ -72,21 +151,139 @@ class Gmail:
     def label_from_name(self, label_name: str) -> BaseLabel:
         return self.labels._registry.get_by_name(label_name).entity
 
+    def batch_modify(self, messages: Collection[Message], add: Union[BaseLabel, Collection[BaseLabel]] = None, remove: Union[BaseLabel, Collection[BaseLabel]] = None) -> list[Message]:
+        """Add and remove any number of labels (or categories) on any number of messages, with one request per 'Gmail.BATCH_MODIFY_SIZE' messages. The labels of the given messages are updated in place rather than refetched."""
+        label_types, messages = (self.Constructors.Label, self.Constructors.Category), list(messages)
+        add_ids = [] if add is None else [label.id for label in as_list(add, of_type=label_types)]
+        remove_ids = [] if remove is None else [label.id for label in as_list(remove, of_type=label_types)]
+
+        if not messages or not (add_ids or remove_ids):
+            return messages
+
+        for start in range(0, len(messages), self.BATCH_MODIFY_SIZE):
+            body = {"ids": [message.id for message in messages[start:start + self.BATCH_MODIFY_SIZE]], "addLabelIds": add_ids, "removeLabelIds": remove_ids}
+            self._messages.batchModify(userId="me", body=body).execute()
+
+        for message in messages:
+            label_ids = [label_id for label_id in message.resource.get("labelIds", ()) if label_id not in remove_ids]
+            message._set_label_ids(label_ids + [label_id for label_id in add_ids if label_id not in label_ids])
+
+        return messages
+
     def _refresh_labels(self):
         self.labels._refresh()
 
+    @property
+    def _http(self) -> AuthorizedHttp:
+        """An authorized http client belonging to the calling thread, as httplib2 connections cannot be shared between threads."""
+        if (http := getattr(self._local, "http", None)) is None:
+            http = self._local.http = AuthorizedHttp(self.credentials, http=build_http())
+
+        return http
+
+    def _build_request(self, http: Any, *args: Any, **kwargs: Any) -> HttpRequest:
+        """Build every api request on the calling thread's own http client, so that connections are kept alive and reused rather than shared between threads."""
+        return HttpRequest(self._http, *args, **kwargs)
+
+    def _execute_requests(self, requests: Iterable[HttpRequest]) -> list[dict]:
+        """Execute the given requests and return their responses in the order the requests were given, in batches of up to 'Gmail.BATCH_SIZE' requests, or one at a time if batching is disabled."""
+        requests = list(requests)
+        if not self.BATCH_SIZE:
+            return [request.execute() for request in requests]
+
+        responses = []
+        for start in range(0, len(requests), self.BATCH_SIZE):
+            responses += self._execute_in_batch(requests[start:start + self.BATCH_SIZE])
+
+        return responses
+
+    def _execute_in_batch(self, requests: Iterable[HttpRequest]) -> list[dict]:
+        """
+        Execute the given requests as a single batch request and return their responses in the order the requests were given.
+        Requests rejected by the api's rate limiter are retried in a further batch after an exponentially increasing backoff.
+        """
+        requests = list(requests)
+        collector, pending, retries = _BatchCollector(len(requests)), range(len(requests)), 0
+
+        while pending:
+            if (delay := self._next_batch_not_before - time.monotonic()) > 0:
+                time.sleep(delay)
+
+            collector.rate_limited, collector.retry = [], retries < self.BATCH_MAX_RETRIES
+            batch = self.service.new_batch_http_request(callback=collector)
+            for index in pending:
+                batch.add(requests[index], request_id=str(index))
+
+            batch.execute(http=self._http)
+
+            if collector.rate_limited:
+                self._back_off()
+            else:
+                with self._lock:
+                    self._backoff = 0
+
+            pending, retries = collector.rate_limited, retries + 1
+
+        return collector.responses
+
+    def _back_off(self) -> None:
+        """Double the delay before the next batch may be sent (starting from 'Gmail.BATCH_BACKOFF_SECONDS'), up to a maximum of 32 times that."""
+        with self._lock:
+            self._backoff = min(2*self._backoff, 32*self.BATCH_BACKOFF_SECONDS) if self._backoff else self.BATCH_BACKOFF_SECONDS
+            self._next_batch_not_before = time.monotonic() + self._backoff
+
+    @staticmethod
+    def _is_rate_limit_error(exception: Exception) -> bool:
+        return isinstance(exception, HttpError) and (exception.resp.status == 429 or (exception.resp.status == 403 and b"ratelimitexceeded" in exception.content.lower()))
+
     def _ensure_credentials_are_valid(self) -> None:
+        from google.auth.transport.requests import Request
+        from google_auth_oauthlib.flow import InstalledAppFlow
+
         if self.credentials and self.credentials.expired and self.credentials.refresh_token:
             self.credentials.refresh(Request())
-            self.token.write(self.credentials)
 
         if not self.credentials or not self.credentials.valid:
             print("Before continuing, please create a new Gmail API project with OAuth 2.0 credentials, or download your credentials from an existing project.")
             webbrowser.open("https://console.developers.google.com/")
             self.credentials = InstalledAppFlow.from_client_secrets_file(str(self._request_credentials_json()), self.DEFAULT_SCOPES).run_local_server(port=0)
-            self.token.content = self.credentials
+            self._profile_cache.unlink(missing_ok=True)
+
+    def _read_token(self) -> Optional[Credentials]:
+        """Read the stored credentials from the json token file. A token pickled by an older version of this library is read once and then replaced by the json token."""
+        if (legacy := self.token.path.with_suffix(".pkl")).exists():
+            credentials = File.from_pathlike(legacy).read()
+            legacy.unlink()
+            return credentials
+
+        if self.token.path.exists() and (info := self.token.path.read_text()):
+            self._written_token = (credentials := Credentials.from_authorized_user_info(json.loads(info), self.DEFAULT_SCOPES)).token
+            return credentials
+
+        return None
+
+    def _write_token(self) -> None:
+        """Write the credentials to the json token file, but only if the access token has changed since it was last read or written."""
+        if self.credentials.token != self._written_token:
+            self.token.path.write_text(self.credentials.to_json())
+            self._written_token = self.credentials.token
+
+    @property
+    def _profile_cache(self) -> Path:
+        return self.token.path.with_name("profile.json")
+
+    def _read_address(self) -> str:
+        """Read the account's email address from the profile cache next to the token, fetching it (and rewriting the cache) only when the cache is missing or older than 'Gmail.PROFILE_CACHE_SECONDS'."""
+        if (cache := self._profile_cache).exists() and time.time() - cache.stat().st_mtime < self.PROFILE_CACHE_SECONDS:
+            return json.loads(cache.read_text())["emailAddress"]
+
+        profile = self.service.users().getProfile(userId="me", fields="emailAddress").execute()
+        cache.write_text(json.dumps(profile))
+        return profile["emailAddress"]
 
     def _request_credentials_json(self) -> File:
+        from iotools import Gui, Widget
+
         with Gui(name="gmail", on_close=lambda: None) as gui:
             Widget.Label("Please provide a client secrets JSON file...").stack()
             file_select = Widget.FileSelect().stack()
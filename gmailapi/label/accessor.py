@@ -5,59 +5,51 @@ from typing import Optional, TYPE_CHECKING
 from subtypes import NameSpace
 
 from .registry import Registry
+from .label import SystemLabel, Category
 from .mapper import LabelMapper, CategoryMapper
 from .hierarchy import Root
 
 if TYPE_CHECKING:
     from gmailapi.gmail import Gmail
+    from .proxy import LabelProxy, CategoryProxy
 
 
 class SystemLabels:
-    _id_name_mappings = {
-        "INBOX": "Inbox",
-        "SENT": "Sent",
-        "UNREAD": "Unread",
-        "IMPORTANT": "Important",
-        "STARRED": "Starred",
-        "DRAFT": "Draft",
-        "CHAT": "Chat",
-        "TRASH": "Trash",
-        "SPAM": "Spam"
-    }
+    _id_name_mappings = SystemLabel._id_name_mappings
+
+    inbox: LabelProxy
+    sent: LabelProxy
+    unread: LabelProxy
+    important: LabelProxy
+    starred: LabelProxy
+    draft: LabelProxy
+    chat: LabelProxy
+    trash: LabelProxy
+    spam: LabelProxy
 
     def __init__(self, gmail: Gmail) -> None:
         self._gmail = gmail
-        self.inbox = LabelMapper(id_="INBOX", name=self._id_name_mappings["INBOX"], gmail=self._gmail).proxy
-        self.sent = LabelMapper(id_="SENT", name=self._id_name_mappings["SENT"], gmail=self._gmail).proxy
-        self.unread = LabelMapper(id_="UNREAD", name=self._id_name_mappings["UNREAD"], gmail=self._gmail).proxy
-        self.important = LabelMapper(id_="IMPORTANT", name=self._id_name_mappings["IMPORTANT"], gmail=self._gmail).proxy
-        self.starred = LabelMapper(id_="STARRED", name=self._id_name_mappings["STARRED"], gmail=self._gmail).proxy
-        self.draft = LabelMapper(id_="DRAFT", name=self._id_name_mappings["DRAFT"], gmail=self._gmail).proxy
-        self.chat = LabelMapper(id_="CHAT", name=self._id_name_mappings["CHAT"], gmail=self._gmail).proxy
-        self.trash = LabelMapper(id_="TRASH", name=self._id_name_mappings["TRASH"], gmail=self._gmail).proxy
-        self.spam = LabelMapper(id_="SPAM", name=self._id_name_mappings["SPAM"], gmail=self._gmail).proxy
+        for id_, name in self._id_name_mappings.items():
+            setattr(self, name.lower(), LabelMapper(id_=id_, name=name, gmail=self._gmail).proxy)
 
 
 class SystemCategories:
-    _id_name_mappings = {
-        "CATEGORY_PERSONAL": "Primary",
-        "CATEGORY_SOCIAL": "Social",
-        "CATEGORY_PROMOTIONS": "Promotions",
-        "CATEGORY_UPDATES": "Updates",
-        "CATEGORY_FORUMS": "Forums"
-    }
+    _id_name_mappings = Category._id_name_mappings
+
+    primary: CategoryProxy
+    social: CategoryProxy
+    promotions: CategoryProxy
+    updates: CategoryProxy
+    forums: CategoryProxy
 
     def __init__(self, gmail: Gmail) -> None:
         self._gmail = gmail
-        self.primary = CategoryMapper(id_="CATEGORY_PERSONAL", name=self._id_name_mappings["CATEGORY_PERSONAL"], gmail=self._gmail).proxy
-        self.social = CategoryMapper(id_="CATEGORY_SOCIAL", name=self._id_name_mappings["CATEGORY_SOCIAL"], gmail=self._gmail).proxy
-        self.promotions = CategoryMapper(id_="CATEGORY_PROMOTIONS", name=self._id_name_mappings["CATEGORY_PROMOTIONS"], gmail=self._gmail).proxy
-        self.updates = CategoryMapper(id_="CATEGORY_UPDATES", name=self._id_name_mappings["CATEGORY_UPDATES"], gmail=self._gmail).proxy
-        self.forums = CategoryMapper(id_="CATEGORY_FORUMS", name=self._id_name_mappings["CATEGORY_FORUMS"], gmail=self._gmail).proxy
+        for id_, name in self._id_name_mappings.items():
+            setattr(self, name.lower(), CategoryMapper(id_=id_, name=name, gmail=self._gmail).proxy)
 
 
 class LabelAccessor:
-    _system_ids = set(SystemLabels._id_name_mappings) | set(SystemCategories._id_name_mappings)
+    _system_ids = frozenset(SystemLabels._id_name_mappings) | frozenset(SystemCategories._id_name_mappings)
 
     def __init__(self, gmail: Gmail) -> None:
         self._gmail = gmail
@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, Optional
+from collections import defaultdict, deque
+from typing import TYPE_CHECKING, Optional, Union
 
 from miscutils import ReprMixin
-from subtypes import Dict, Str, NameSpace
+from subtypes import NameSpace
 
 from .registry import Registry
 from .mapper import LabelMapper
+from .label import BaseLabel
 
 
 if TYPE_CHECKING:
@@ -20,70 +22,57 @@ class Root(ReprMixin):
 
     def refresh(self, old_registry: Registry, new_registry: Registry, root_namespace: NameSpace) -> None:
 
-        self.register_children_recursively(labels=Dict(self.gmail.service.users().labels().list(userId="me").execute()).labels,
-                                           old_registry=old_registry, new_registry=new_registry)
+        self.register_children(labels=self.gmail.service.users().labels().list(userId="me", fields=f"labels({BaseLabel._listing_fields})").execute().get("labels", []),
+                               old_registry=old_registry, new_registry=new_registry)
         self.regenerate_labels(root_namespace=root_namespace)
 
-    def register_children_recursively(self, labels: list, old_registry: Registry, new_registry: Registry) -> None:
+    def register_children(self, labels: list[dict], old_registry: Registry, new_registry: Registry) -> None:
+        """Build the label tree in linear time. Labels are first grouped under the name of their parent, and the tree is then built breadth-first, attaching each group to its parent node keyed by the last segment of each label's name."""
         from .accessor import LabelAccessor
 
-        children, deep_children = [], []
+        children_by_parent: defaultdict[str, list[tuple[str, dict]]] = defaultdict(list)
+        system_ids = LabelAccessor._system_ids
 
         for label in labels:
-            if "/" in label.name:
-                deep_children.append(label)
+            if label["id"] in system_ids:
+                if new_registry.contains_by_id(label["id"]):
+                    new_registry.get_by_id(label["id"]).resource = label
             else:
-                if label.id not in LabelAccessor._system_ids:
-                    children.append(label)
-
-        for child in children:
-            if old_registry.contains_by_id(child.id):
-                node = old_registry.get_by_id(child.id)
-                node.parent = None
-            else:
-                node = Node(gmail=self.gmail, id_=child.id, name=child.name, parent=None)
-
-            self.children[child.name] = node
+                parent_name, _, stem = label["name"].rpartition("/")
+                children_by_parent[parent_name].append((stem, label))
+
+        names = {label["name"] for group in children_by_parent.values() for _, label in group}
+        for parent_name in [name for name in children_by_parent if name and name not in names]:
+            children_by_parent[""] += [(label["name"], label) for _, label in children_by_parent.pop(parent_name)]
+
+        pending: deque[tuple[Union[Root, Node], str]] = deque([(self, "")])
+        while pending:
+            container, container_name = pending.popleft()
+            parent = None if container is self else container
+
+            for stem, label in children_by_parent.get(container_name, ()):
+                if old_registry.contains_by_id(label["id"]):
+                    node = old_registry.get_by_id(label["id"])
+                    node.name, node.parent, node.resource, node.children = label["name"], parent, label, {}
+                else:
+                    node = Node(gmail=self.gmail, id_=label["id"], name=label["name"], parent=parent, resource=label)
 
-        for child in self.children.values():
-            child.register_children_recursively(deep_children, old_registry=old_registry, new_registry=new_registry)
+                new_registry.set(node)
+                container.children[stem] = node
+                pending.append((node, label["name"]))
 
     def regenerate_labels(self, root_namespace: NameSpace) -> None:
         root_namespace({name: child.proxy for name, child in self.children.items()})
 
-        for child in self.children.values():
-            child.regenerate_labels()
+        pending = deque(self.children.values())
+        while pending:
+            node = pending.popleft()
+            node.proxy({name: child.proxy for name, child in node.children.items()})
+            pending.extend(node.children.values())
 
 
 class Node(LabelMapper):
-    def __init__(self, gmail: Gmail, id_: str, name: str, parent: Optional[Node]) -> None:
-        super().__init__(gmail=gmail, id_=id_, name=name)
+    def __init__(self, gmail: Gmail, id_: str, name: str, parent: Optional[Node], resource: dict = None) -> None:
+        super().__init__(gmail=gmail, id_=id_, name=name, resource=resource)
         self.parent = parent
         self.children: dict[str, Node] = {}
-
-    def register_children_recursively(self, labels: list, old_registry: Registry, new_registry: Registry) -> None:
-        new_registry.set(self)
-
-        children = [label for label in labels if label.name.startswith(self.name)]
-        deep_children = []
-
-        for label in labels:
-            if "/" in (name := Str(label.name).slice.after_first(f"{self.name}/")):
-                deep_children.append(label)
-            else:
-                if old_registry.contains_by_id(label.id):
-                    node = old_registry.get_by_id(label.id)
-                    node.parent = self
-                else:
-                    node = type(self)(gmail=self.gmail, id_=label.id, name=label.name, parent=self)
-
-                self.children[name] = node
-
-        for child in self.children.values():
-            child.register_children_recursively(deep_children, old_registry=old_registry, new_registry=new_registry)
-
-    def regenerate_labels(self) -> None:
-        self.proxy({name: child.proxy for name, child in self.children.items()})
-
-        for child in self.children.values():
-            child.regenerate_labels()
@@ -1,8 +1,6 @@
 from __future__ import annotations
 
-from typing import Union, TYPE_CHECKING
-
-from subtypes import Dict
+from typing import Any, Collection, Union, TYPE_CHECKING
 
 if TYPE_CHECKING:
     from gmailapi.gmail import Gmail
@@ -11,9 +9,17 @@ if TYPE_CHECKING:
 
 
 class BaseLabel:
-    def __init__(self, label_id: str, *, gmail: Gmail) -> None:
+    _resource_fields = "id,name,type,messagesTotal,messagesUnread,threadsTotal,threadsUnread,messageListVisibility,labelListVisibility"
+    _listing_fields = "id,name,type,messageListVisibility,labelListVisibility"
+
+    def __init__(self, label_id: str, *, gmail: Gmail, resource: dict = None) -> None:
         self.id, self.gmail = label_id, gmail
-        self.refresh()
+
+        if resource is None:
+            self.refresh()
+        else:
+            self.resource = resource
+            self._set_attributes_from_resource()
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}(name={repr(self.name)}, messages_total={repr(self.messages_total)}, messages_unread={repr(self.messages_unread)})"
@@ -27,6 +33,9 @@ class BaseLabel:
     def __hash__(self) -> int:
         return hash(self.id)
 
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, BaseLabel) and self.id == other.id
+
     def __getitem__(self, name: str) -> BaseLabel:
         return self.gmail.labels._registry.get_by_id(self.id).children[name].entity
 
@@ -34,34 +43,83 @@ class BaseLabel:
     def messages(self) -> Query:
         return self.gmail.messages.labels(self)
 
+    @property
+    def messages_total(self) -> int:
+        return self._count("messagesTotal")
+
+    @property
+    def messages_unread(self) -> int:
+        return self._count("messagesUnread")
+
+    @property
+    def threads_total(self) -> int:
+        return self._count("threadsTotal")
+
+    @property
+    def threads_unread(self) -> int:
+        return self._count("threadsUnread")
+
     def refresh(self) -> BaseLabel:
-        self.resource = Dict(self.gmail.service.users().labels().get(userId="me", id=self.id).execute())
+        self.resource = self.gmail.service.users().labels().get(userId="me", id=self.id, fields=self._resource_fields).execute()
+        self._set_attributes_from_resource()
+        return self
 
-        self.id, self.name, self.type = self.resource.id, self.resource.name, self.resource.get("type", "user")
-        self.messages_total, self.messages_unread = self.resource.messagesTotal, self.resource.messagesUnread
-        self.threads_total, self.threads_unread = self.resource.threadsTotal, self.resource.threadsUnread
+    @staticmethod
+    def refresh_many(labels: Collection[BaseLabel]) -> list[BaseLabel]:
+        """Refresh several labels at once, fetching their resources in batched requests rather than with one request per label."""
+        if not (labels := list(labels)):
+            return labels
+
+        gmail = labels[0].gmail
+        for label, resource in zip(labels, gmail._execute_requests(gmail.service.users().labels().get(userId="me", id=label.id, fields=label._resource_fields) for label in labels)):
+            label.resource = resource
+            label._set_attributes_from_resource()
+
+        return labels
+
+    def _set_attributes_from_resource(self) -> None:
+        self.id, self.name, self.type = self.resource["id"], self.resource["name"], self.resource.get("type", "user")
         self.message_list_visibility, self.label_list_visibility = self.resource.get("messageListVisibility"), self.resource.get("labelListVisibility")
-        return self
+
+    def _count(self, key: str) -> int:
+        """Label listings don't include message and thread counts, so fetch the full label resource the first time one of them is needed."""
+        if key not in self.resource:
+            self.refresh()
+
+        return self.resource.get(key)
 
 
 class Category(BaseLabel):
+    _id_name_mappings = {
+        "CATEGORY_PERSONAL": "Primary",
+        "CATEGORY_SOCIAL": "Social",
+        "CATEGORY_PROMOTIONS": "Promotions",
+        "CATEGORY_UPDATES": "Updates",
+        "CATEGORY_FORUMS": "Forums"
+    }
+
     def __contains__(self, other: Message) -> bool:
         if isinstance(other, self.gmail.Constructors.Message):
             return self == other.category
         else:
             raise TypeError(f"Cannot test '{type(other).__name__}' object for membership in a '{type(self).__name__}' object. Must be type '{Message.__name__}'.")
 
-    def refresh(self) -> None:
-        from .accessor import SystemCategories
-
-        super().refresh()
-        self.name = SystemCategories._id_name_mappings[self.id]
+    def _set_attributes_from_resource(self) -> None:
+        super()._set_attributes_from_resource()
+        self.name = self._id_name_mappings[self.id]
 
 
 class Label(BaseLabel):
     def __contains__(self, other: Union[BaseLabel, Message]) -> bool:
         if isinstance(other, BaseLabel):
-            return other.name in self.name
+            node = self.gmail.labels._registry.get_by_id(self.id)
+            while node is not None:
+                if node.id == other.id:
+                    return True
+
+                node = getattr(node, "parent", None)
+
+            return False
         elif isinstance(other, self.gmail.Constructors.Message):
             return self in other.labels
         else:
@@ -84,14 +142,21 @@ class UserLabel(Label):
 
     def update(self, name: str = None, label_list_visibility: str = None, message_list_visibility: set = None,
                text_color: str = None, background_color: str = None) -> BaseLabel:
-        color = {
-            name: val for name, val in {"textColor": text_color, "backgroundColor": background_color}.items() if val is not None
-        } if text_color or background_color else None
-        body = {
-            name: val for name, val in {
-                "name": name, "labelListVisibility": label_list_visibility, "messageListVisibility": message_list_visibility, "color": color
-            }.items() if val is not None
-        }
+        body, color = {}, {}
+
+        if name is not None:
+            body["name"] = name
+        if label_list_visibility is not None:
+            body["labelListVisibility"] = label_list_visibility
+        if message_list_visibility is not None:
+            body["messageListVisibility"] = message_list_visibility
+
+        if text_color is not None:
+            color["textColor"] = text_color
+        if background_color is not None:
+            color["backgroundColor"] = background_color
+        if color:
+            body["color"] = color
 
         if not body:
             raise RuntimeError(f"Cannot call {type(self).__name__}.{self.update.__name__} without arguments.")
@@ -104,12 +169,13 @@ class UserLabel(Label):
         return self
 
     def delete(self, recursive: bool = False) -> None:
-        self.gmail.service.users().labels().delete(userId="me", id=self.id).execute()
-
-        if recursive:
-            for label in Dict(self.gmail.service.users().labels().list(userId="me").execute()).labels:
-                if label.name.startswith(f"{self.name}/") and label.type == "user":
-                    self.gmail.service.users().labels().delete(userId="me", id=label.id).execute()
+        """Delete this label. If 'recursive' is True, all of its descendants are deleted along with it, in batched requests rather than one request per label."""
+        if not recursive:
+            self.gmail.service.users().labels().delete(userId="me", id=self.id).execute()
+        else:
+            labels = self.gmail.service.users().labels().list(userId="me", fields="labels(id,name,type)").execute().get("labels", [])
+            label_ids = [self.id, *(label["id"] for label in labels if label["name"].startswith(f"{self.name}/") and label["type"] == "user")]
+            self.gmail._execute_requests(self.gmail.service.users().labels().delete(userId="me", id=label_id) for label_id in label_ids)
 
         self.gmail._refresh_labels()
 
@@ -122,14 +188,25 @@ class UserLabel(Label):
             if color:
                 label["color"] = color
 
-        label = cls(label_id=gmail.service.users().labels().create(userId="me", body=label).execute()["id"], gmail=gmail)
+        resource = gmail.service.users().labels().create(userId="me", body=label).execute()
+        label = cls(label_id=resource["id"], gmail=gmail, resource=resource)
         gmail._refresh_labels()
         return label
 
 
 class SystemLabel(Label):
-    def refresh(self) -> None:
-        from .accessor import SystemLabels
-
-        super().refresh()
-        self.name = SystemLabels._id_name_mappings[self.id]
+    _id_name_mappings = {
+        "INBOX": "Inbox",
+        "SENT": "Sent",
+        "UNREAD": "Unread",
+        "IMPORTANT": "Important",
+        "STARRED": "Starred",
+        "DRAFT": "Draft",
+        "CHAT": "Chat",
+        "TRASH": "Trash",
+        "SPAM": "Spam"
+    }
+
+    def _set_attributes_from_resource(self) -> None:
+        super()._set_attributes_from_resource()
+        self.name = self._id_name_mappings[self.id]
@@ -5,15 +5,17 @@ from typing import Any, TYPE_CHECKING, Optional, Type
 from miscutils import ReprMixin
 
 from .proxy import BaseProxy, LabelProxy, CategoryProxy
-from .label import BaseLabel, Label, Category
+from .label import BaseLabel, Label, SystemLabel, Category
 
 if TYPE_CHECKING:
     from gmailapi.gmail import Gmail
 
 
 class BaseMapper(ReprMixin):
-    def __init__(self, gmail: Gmail, id_: str, name: str) -> None:
-        self.gmail, self.id, self.name = gmail, id_, name
+    is_category = False
+
+    def __init__(self, gmail: Gmail, id_: str, name: str, resource: dict = None) -> None:
+        self.gmail, self.id, self.name, self.resource = gmail, id_, name, resource
 
         self.proxy: Optional[BaseProxy] = self.proxy_constructor(mapper=self)
         self._entity: Optional[BaseLabel] = None
@@ -29,14 +31,14 @@ class BaseMapper(ReprMixin):
     @property
     def entity(self) -> Any:
         if self._entity is None:
-            self._entity = self.entity_constructor(label_id=self.id, gmail=self.gmail)
+            self._entity = self.entity_constructor(label_id=self.id, gmail=self.gmail, resource=self.resource)
 
         return self._entity
 
 
 class LabelMapper(BaseMapper):
-    def __init__(self, gmail: Gmail, id_: str, name: str) -> None:
-        super().__init__(gmail=gmail, id_=id_, name=name)
+    def __init__(self, gmail: Gmail, id_: str, name: str, resource: dict = None) -> None:
+        super().__init__(gmail=gmail, id_=id_, name=name, resource=resource)
 
     @property
     def proxy_constructor(self) -> Type[LabelProxy]:
@@ -44,8 +46,7 @@ class LabelMapper(BaseMapper):
 
     @property
     def entity_constructor(self) -> Type[Label]:
-        from .accessor import SystemLabels
-        return self.gmail.Constructors.SystemLabel if self.id in SystemLabels._id_name_mappings else self.gmail.Constructors.UserLabel
+        return self.gmail.Constructors.SystemLabel if self.id in SystemLabel._id_name_mappings else self.gmail.Constructors.UserLabel
 
     @property
     def entity(self) -> Label:
@@ -53,6 +54,8 @@ class LabelMapper(BaseMapper):
 
 
 class CategoryMapper(BaseMapper):
+    is_category = True
+
     @property
     def proxy_constructor(self):
         return CategoryProxy
@@ -1,33 +1,62 @@
 from __future__ import annotations
 
-from typing import Any, TYPE_CHECKING, Optional
-
-from subtypes import NameSpace
+from typing import Any, Iterator, TYPE_CHECKING, Optional
 
 if TYPE_CHECKING:
-    from .label import Category, Label
+    from .label import BaseLabel, Category, Label
     from .mapper import BaseMapper
 
 
-class BaseProxy(NameSpace):
+class BaseProxy:
+    """A lightweight node of the label namespace. Child proxies are exposed as attributes, and calling the proxy without arguments returns its label."""
+    __slots__ = ("_mapper_", "_children")
+
     def __init__(self, mapper: BaseMapper) -> None:
-        self._mapper_ = mapper
+        self._mapper_, self._children = mapper, {}
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}({', '.join([f'{repr(self._mapper_.name)}', *[f'{attr}={repr(val)}' for attr, val in self]])})"
 
+    def __getattr__(self, name: str) -> BaseProxy:
+        if not name.startswith("_"):
+            try:
+                return self._children[name]
+            except KeyError:
+                pass
 
-class LabelProxy(BaseProxy):
-    def __call__(self, mapping: dict = None, /, **kwargs: Any) -> Optional[Label]:
+        raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'.")
+
+    def __iter__(self) -> Iterator[tuple[str, BaseProxy]]:
+        return iter(self._children.items())
+
+    def __len__(self) -> int:
+        return len(self._children)
+
+    def __getitem__(self, name: str) -> BaseProxy:
+        return self._children[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._children
+
+    def __dir__(self) -> list[str]:
+        return [*super().__dir__(), *self._children]
+
+    def __call__(self, mapping: dict = None, /, **kwargs: Any) -> Optional[BaseLabel]:
         if mapping is None and not kwargs:
             return self._mapper_.entity
         else:
-            super().__call__(mapping, **kwargs)
+            self._children = {**(mapping or {}), **kwargs}
+
+
+class LabelProxy(BaseProxy):
+    __slots__ = ()
+
+    def __call__(self, mapping: dict = None, /, **kwargs: Any) -> Optional[Label]:
+        return super().__call__(mapping, **kwargs)
 
 
 class CategoryProxy(BaseProxy):
+    __slots__ = ()
+
     def __call__(self, mapping: dict = None, /, **kwargs: Any) -> Optional[Category]:
-        if mapping is None and not kwargs:
-            return self._mapper_.entity
-        else:
-            super().__call__(mapping, **kwargs)
+        return super().__call__(mapping, **kwargs)
@@ -7,36 +7,37 @@ if TYPE_CHECKING:
 
 
 class Registry:
+    """Mappers indexed by label id, with a secondary index from label name to label id."""
+
     def __init__(self):
-        self.id_mappings: dict[str, BaseMapper] = {}
-        self.name_mappings: dict[str, BaseMapper] = {}
+        self._by_id: dict[str, BaseMapper] = {}
+        self._name_to_id: dict[str, str] = {}
 
     def get_by_id(self, id_: str) -> BaseMapper:
-        return self.id_mappings[id_]
+        return self._by_id[id_]
 
     def get_by_name(self, name: str) -> BaseMapper:
-        return self.name_mappings[name]
+        return self._by_id[self._name_to_id[name]]
 
     def set(self, node: BaseMapper) -> None:
-        self.id_mappings[node.id] = node
-        self.name_mappings[node.name] = node
+        self._by_id[node.id] = node
+        self._name_to_id[node.name] = node.id
 
     def pop_by_id(self, id_: str):
-        self.name_mappings.pop(self.id_mappings.pop(id_).name)
+        del self._name_to_id[self._by_id.pop(id_).name]
 
     def pop_by_name(self, name: str):
-        self.id_mappings.pop(self.name_mappings.pop(name).id)
+        del self._by_id[self._name_to_id.pop(name)]
 
     def pop(self, node: BaseMapper):
-        self.id_mappings.pop(node.id)
-        self.name_mappings.pop(node.name)
+        del self._by_id[node.id], self._name_to_id[node.name]
 
     def contains_by_id(self, id_: str) -> bool:
-        return id_ in self.id_mappings
+        return id_ in self._by_id
 
     def contains_by_name(self, name: str) -> bool:
-        return name in self.name_mappings
+        return name in self._name_to_id
 
     def clear(self) -> None:
-        self.id_mappings.clear()
-        self.name_mappings.clear()
+        self._by_id.clear()
+        self._name_to_id.clear()
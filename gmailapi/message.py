@@ -1,29 +1,58 @@
 from __future__ import annotations
 
+from base64 import b64encode
+from email import message_from_bytes, policy
+from email.headerregistry import BaseHeader
+from email.message import EmailMessage
+from functools import cached_property
+from weakref import WeakValueDictionary
 from typing import Any, Tuple, Union, Collection, Optional, TYPE_CHECKING
 
-import mailparser
-
 from pathmagic import File, Dir, PathLike
-from subtypes import Dict, BaseList, Date, DateTime, Html
-from miscutils import OneOrMany, Base64
-from iotools import HtmlGui
+from subtypes import BaseList, Date, DateTime, Html, Enum
 
+from .utils import as_list
 from .draft import MessageDraft
 from .attribute import EquatableAttribute, ComparableAttribute, BooleanAttribute, EnumerableAttribute, OrderableAttributeMixin, ComparableName
 
+try:
+    from pybase64 import urlsafe_b64decode
+except ImportError:
+    from base64 import urlsafe_b64decode
+
 if TYPE_CHECKING:
     from .gmail import Gmail
+    from googleapiclient.http import HttpRequest
     from .label import BaseLabel, Label, Category
 
 
+def _decode_text(part: EmailMessage) -> str:
+    """Decode a text part of a message, falling back to utf-8 when it declares a charset python does not know."""
+    payload = part.get_payload(decode=True) or b""
+    try:
+        return payload.decode(part.get_content_charset() or "utf-8", errors="replace")
+    except LookupError:
+        return payload.decode("utf-8", errors="replace")
+
+
 class Message:
-    def __init__(self, resource: Dict, gmail: Gmail) -> None:
+    class Format(Enum):
+        """The formats a message can be fetched in. 'METADATA' only fetches the headers, and the body and attachments are fetched in 'RAW' format when first accessed."""
+        RAW, METADATA = "raw", "metadata"
+
+    _resource_fields = {
+        Format.RAW: "id,threadId,labelIds,sizeEstimate,internalDate,raw",
+        Format.METADATA: "id,threadId,labelIds,sizeEstimate,internalDate,payload/headers",
+    }
+    _metadata_headers = ["Subject", "From", "To", "Cc", "Bcc"]
+    _lazy_attributes = ("date", "parsed", "subject", "from_", "to", "cc", "bcc", "body", "attachments", "labels", "category", "_headers", "_parts", "_labels_and_category")
+
+    def __init__(self, resource: dict, gmail: Gmail) -> None:
         self.resource, self.gmail = resource, gmail
         self._set_attributes_from_resource()
 
     def __repr__(self) -> str:
-        return f"{type(self).__name__}(subject={repr(self.subject)}, from={repr(str(self.from_))}, to={repr([str(contact) for contact in self.to])}, date='{self.date}')"
+        return f"{type(self).__name__}(subject={self.subject!r}, from={str(self.from_)!r}, to=[{', '.join(map(repr, map(str, self.to or ())))}], date='{self.date}')"
 
     def __str__(self) -> str:
         return self.body.text
@@ -44,57 +73,106 @@ class Message:
         else:
             raise TypeError(f"Cannot test '{type(other).__name__}' object for membership in a '{type(self).__name__}' object. Must be type '{BaseLabel.__name__}'.")
 
+    @property
+    def format(self) -> Message.Format:
+        return self.Format.RAW if "raw" in self.resource else self.Format.METADATA
+
+    @cached_property
+    def date(self) -> DateTime:
+        return DateTime.fromtimestamp(int(self.resource["internalDate"])/1000)
+
+    @cached_property
+    def parsed(self) -> Optional[EmailMessage]:
+        return message_from_bytes(urlsafe_b64decode(self.resource["raw"]), policy=policy.default) if self.format is self.Format.RAW else None
+
+    @cached_property
+    def subject(self) -> Optional[str]:
+        subject = self.parsed["subject"] if self.format is self.Format.RAW else self._headers.get("subject")
+        return None if subject is None else str(subject)
+
+    @cached_property
+    def from_(self) -> Optional[Contact]:
+        return self.gmail.Constructors.Contact.or_none(self._addresses("from"))
+
+    @cached_property
+    def to(self) -> Optional[list[Contact]]:
+        return self.gmail.Constructors.Contact.many_or_none(self._addresses("to"))
+
+    @cached_property
+    def cc(self) -> Optional[list[Contact]]:
+        return self.gmail.Constructors.Contact.many_or_none(self._addresses("cc"))
+
+    @cached_property
+    def bcc(self) -> Optional[list[Contact]]:
+        return self.gmail.Constructors.Contact.many_or_none(self._addresses("bcc"))
+
+    @cached_property
+    def body(self) -> Body:
+        if self.format is not self.Format.RAW:
+            self.refresh(format_=self.Format.RAW)
+
+        text, html, _ = self._parts
+        return Body(text="\n\n".join(text), html="\n\n".join(html))
+
+    @cached_property
+    def attachments(self) -> Attachments:
+        if self.format is not self.Format.RAW:
+            self.refresh(format_=self.Format.RAW)
+
+        return Attachments(self._parts[2])
+
+    @cached_property
+    def labels(self) -> set[Label]:
+        return self._labels_and_category[0]
+
+    @cached_property
+    def category(self) -> Optional[Category]:
+        return self._labels_and_category[1]
+
     def render(self) -> None:
         """Render the message body html in a separate window. Will block until the window has been closed by a user."""
+        from iotools import HtmlGui
         HtmlGui(name=self.subject, text=str(self.body.html)).start()
 
     def change_category_to(self, category: Category) -> Message:
         if isinstance(category, self.gmail.Constructors.Category):
-            self.gmail.service.users().messages().modify(userId="me", id=self.id, body={"removeLabelIds": self.category.id, "addLabelIds": category.id}).execute()
-            self.refresh()
+            return self.modify_labels(add=category, remove=self.category)
         else:
             raise TypeError(f"Argument to '{self.change_category_to.__name__}' must be of type '{self.gmail.Constructors.Category.__name__}', not '{type(category).__name__}'.")
 
-        return self
+    def modify_labels(self, add: Union[BaseLabel, Collection[BaseLabel]] = None, remove: Union[BaseLabel, Collection[BaseLabel]] = None) -> Message:
+        """Add and remove any number of labels (or categories) on this message with a single request."""
+        label_types = self.gmail.Constructors.Label, self.gmail.Constructors.Category
+        return self._modify_labels(add=None if add is None else as_list(add, of_type=label_types), remove=None if remove is None else as_list(remove, of_type=label_types))
 
     def add_labels(self, labels: Union[Label, Collection[Label]]) -> Message:
-        self.gmail.service.users().messages().modify(userId="me", id=self.id, body={"addLabelIds": [label.id for label in OneOrMany(of_type=self.gmail.Constructors.Label).to_list(labels)]}).execute()
-        self.refresh()
-        return self
+        return self._modify_labels(add=as_list(labels, of_type=self.gmail.Constructors.Label))
 
     def remove_labels(self, labels: Union[Label, Collection[Label]]) -> Message:
-        self.gmail.service.users().messages().modify(userId="me", id=self.id, body={"removeLabelIds": [label.id for label in OneOrMany(of_type=self.gmail.Constructors.Label).to_list(labels)]}).execute()
-        self.refresh()
-        return self
+        return self._modify_labels(remove=as_list(labels, of_type=self.gmail.Constructors.Label))
 
     def mark_is_read(self, is_read: bool = True) -> Message:
-        self.remove_labels(self.gmail.labels.system.unread()) if is_read else self.add_labels(self.gmail.labels.system.unread())
-        return self
+        return self.remove_labels(self.gmail.labels.system.unread()) if is_read else self.add_labels(self.gmail.labels.system.unread())
 
     def mark_is_important(self, is_important: bool = True) -> Message:
-        self.add_labels(self.gmail.labels.system.important()) if is_important else self.remove_labels(self.gmail.labels.system.important())
-        return self
+        return self.add_labels(self.gmail.labels.system.important()) if is_important else self.remove_labels(self.gmail.labels.system.important())
 
     def mark_is_starred(self, is_starred: bool = True) -> Message:
-        self.add_labels(self.gmail.labels.system.starred()) if is_starred else self.remove_labels(self.gmail.labels.system.starred())
-        return self
+        return self.add_labels(self.gmail.labels.system.starred()) if is_starred else self.remove_labels(self.gmail.labels.system.starred())
 
     def archive(self) -> Message:
-        self.remove_labels(self.gmail.labels.INBOX())
-        return self
+        return self.remove_labels(self.gmail.labels.system.inbox())
 
     def trash(self) -> Message:
-        self.gmail.service.users().messages().trash(userId="me", id=self.id).execute()
-        self.refresh()
+        self._set_label_ids(self.gmail._messages.trash(userId="me", id=self.id).execute().get("labelIds", []))
         return self
 
     def untrash(self) -> Message:
-        self.gmail.service.users().messages().untrash(userId="me", id=self.id).execute()
-        self.refresh()
+        self._set_label_ids(self.gmail._messages.untrash(userId="me", id=self.id).execute().get("labelIds", []))
         return self
 
     def delete(self) -> Message:
-        self.gmail.service.users().messages().delete(userId="me", id=self.id).execute()
+        self.gmail._messages.delete(userId="me", id=self.id).execute()
         return self
 
     def reply(self) -> MessageDraft:
@@ -103,36 +181,95 @@ class Message:
     def forward(self) -> MessageDraft:
         return MessageDraft(gmail=self.gmail, parent=self).subject(f"FWD: {self.subject}")
 
-    def refresh(self) -> Message:
-        self.resource = Dict(self.gmail.service.users().messages().get(userId="me", id=self.id, format="raw").execute())
+    def refresh(self, format_: Message.Format = None) -> Message:
+        self.resource = self._request(message_id=self.id, gmail=self.gmail, format_=format_ or self.format).execute()
         self._set_attributes_from_resource()
         return self
 
+    @staticmethod
+    def refresh_many(messages: Collection[Message], format_: Message.Format = None) -> list[Message]:
+        """Refresh several messages at once, fetching their resources in batched requests rather than with one request per message."""
+        if not (messages := list(messages)):
+            return messages
+
+        gmail = messages[0].gmail
+        for message, resource in zip(messages, gmail._execute_requests(message._request(message_id=message.id, gmail=gmail, format_=format_ or message.format) for message in messages)):
+            message.resource = resource
+            message._set_attributes_from_resource()
+
+        return messages
+
     def _set_attributes_from_resource(self) -> None:
-        self.id, self.thread_id, self.size = self.resource.id, self.resource.threadId, self.resource.sizeEstimate
-        self.date = DateTime.fromtimestamp(int(self.resource.internalDate)/1000)
+        """Set the attributes every message needs up front. Everything else is computed from the resource when first accessed, and discarded here whenever the resource changes."""
+        self.id, self.thread_id, self.size = self.resource["id"], self.resource["threadId"], self.resource["sizeEstimate"]
+
+        for name in self._lazy_attributes:
+            self.__dict__.pop(name, None)
+
+    @cached_property
+    def _headers(self) -> dict[str, BaseHeader]:
+        """The headers of a metadata-format message, parsed through the same header registry as the headers of raw-format messages."""
+        return {(name := header["name"].lower()): policy.default.header_factory(name, header["value"]) for header in self.resource["payload"].get("headers", [])}
+
+    @cached_property
+    def _parts(self) -> tuple[list[str], list[str], list[Attachment]]:
+        """Walk the parsed message once, collecting its plain text bodies, html bodies and attachments."""
+        text, html, attachments = [], [], []
+        for part in self.parsed.walk():
+            if part.is_multipart():
+                continue
+
+            if (filename := part.get_filename()) is not None:
+                attachments.append(self.gmail.Constructors.Attachment(name=filename, part=part))
+            elif (content_type := part.get_content_type()) in ("text/plain", "text/html"):
+                (text if content_type == "text/plain" else html).append(_decode_text(part))
+
+        return text, html, attachments
+
+    @cached_property
+    def _labels_and_category(self) -> tuple[set[Label], Optional[Category]]:
+        registry, labels, category = self.gmail.labels._registry, set(), None
+        for label_id in self.resource.get("labelIds", ()):
+            if not (mapper := registry.get_by_id(label_id)).is_category:
+                labels.add(mapper.entity)
+            elif category is None:
+                category = mapper.entity
+
+        return labels, category
+
+    def _set_label_ids(self, label_ids: list[str]) -> None:
+        """Set this message's label ids to a known new value, such as one returned by a modify request, discarding the labels and category derived from the old ones."""
+        self.resource["labelIds"] = label_ids
+
+        for name in ("labels", "category", "_labels_and_category"):
+            self.__dict__.pop(name, None)
+
+    def _modify_labels(self, add: list[BaseLabel] = None, remove: list[BaseLabel] = None) -> Message:
+        """Add and remove the given already-validated labels on this message with a single request."""
+        body = {key: [label.id for label in labels] for key, labels in (("addLabelIds", add), ("removeLabelIds", remove)) if labels is not None}
+
+        if body:
+            self._set_label_ids(self.gmail._messages.modify(userId="me", id=self.id, body=body).execute().get("labelIds", []))
 
-        self.parsed = mailparser.parse_from_bytes(Base64.from_b64(self.resource.raw).bytes)
+        return self
 
-        self.subject = self.parsed.subject
-        self.from_ = self.gmail.Constructors.Contact.or_none(self.parsed.from_)
-        self.to = self.gmail.Constructors.Contact.many_or_none(self.parsed.to)
-        self.cc = self.gmail.Constructors.Contact.many_or_none(self.parsed.cc)
-        self.bcc = self.gmail.Constructors.Contact.many_or_none(self.parsed.bcc)
+    def _addresses(self, name: str) -> Optional[list[Tuple[str, str]]]:
+        headers = self.parsed.get_all(name) if self.format is self.Format.RAW else [self._headers[name]] if name in self._headers else None
+        return [(address.display_name, address.addr_spec) for header in headers for address in header.addresses] if headers else None
 
-        self.body = Body(text="\n\n".join(self.parsed.text_plain),
-                         html="\n\n".join(self.parsed.text_html))
-        self.attachments = Attachments([
-            Attachment(name=attachment["filename"], payload=attachment["payload"]) for attachment in self.parsed.attachments
-        ])
+    @classmethod
+    def from_id(cls, message_id: str, gmail: Gmail, format_: Message.Format = Format.RAW) -> Message:
+        return cls(resource=cls._request(message_id=message_id, gmail=gmail, format_=format_).execute(), gmail=gmail)
 
-        all_labels = [self.gmail.labels._registry.get_by_id(label_id).entity for label_id in self.resource.get("labelIds", [])]
-        self.labels = {label for label in all_labels if isinstance(label, self.gmail.Constructors.Label)}
-        self.category = OneOrMany(of_type=self.gmail.Constructors.Category).to_one_or_none([label for label in all_labels if isinstance(label, self.gmail.Constructors.Category)])
+    @classmethod
+    def from_ids(cls, message_ids: Collection[str], gmail: Gmail, format_: Message.Format = Format.RAW) -> list[Message]:
+        """Fetch several messages at once, in batched requests of up to 'Gmail.BATCH_SIZE' messages rather than with one request per message."""
+        return [cls(resource=resource, gmail=gmail) for resource in gmail._execute_requests(cls._request(message_id=message_id, gmail=gmail, format_=format_) for message_id in message_ids)]
 
     @classmethod
-    def from_id(cls, message_id: str, gmail: Gmail) -> Message:
-        return cls(resource=Dict(gmail.service.users().messages().get(userId="me", id=message_id, format="raw").execute()), gmail=gmail)
+    def _request(cls, message_id: str, gmail: Gmail, format_: Message.Format) -> HttpRequest:
+        kwargs = {"metadataHeaders": cls._metadata_headers} if format_ is cls.Format.METADATA else {}
+        return gmail._messages.get(userId="me", id=message_id, format=format_.value, fields=cls._resource_fields[format_], **kwargs)
 
     class Attribute:
         class From(EquatableAttribute, OrderableAttributeMixin):
@@ -188,11 +325,14 @@ class Message:
 
 
 class Contact:
+    __slots__ = ("name", "address", "__weakref__")
+    _interned: WeakValueDictionary[tuple[type, Optional[str], str], Contact] = WeakValueDictionary()
+
     def __init__(self, name: str, address: str) -> None:
         self.name, self.address = name or None, address
 
     def __repr__(self) -> str:
-        return f"{type(self).__name__}({', '.join([f'{attr}={repr(val)}' for attr, val in self.__dict__.items() if not attr.startswith('_')])})"
+        return f"{type(self).__name__}(name={self.name!r}, address={self.address!r})"
 
     def __str__(self) -> str:
         return self.address
@@ -200,23 +340,34 @@ class Contact:
     def __eq__(self, other: Any) -> bool:
         return str(self) == str(other)
 
+    def __hash__(self) -> int:
+        return hash(self.address)
+
     @classmethod
     def or_none(cls, contact_or_none: list[Tuple[str, str]]) -> Optional[Contact]:
         if contact_or_none:
             from_, = contact_or_none
             name, address = from_
-            return cls(name=name, address=address)
+            return cls._intern(name=name, address=address)
         else:
             return None
 
     @classmethod
     def many_or_none(cls, contacts_or_none: str = None) -> Optional[list[Contact]]:
-        return [cls(name=name, address=address) for name, address in contacts_or_none] if contacts_or_none else None
+        return [cls._intern(name=name, address=address) for name, address in contacts_or_none] if contacts_or_none else None
+
+    @classmethod
+    def _intern(cls, name: str, address: str) -> Contact:
+        """Return a contact with the given name and address, reusing the existing one if any message still holds it, so that repeated senders and recipients share a single object."""
+        if (contact := cls._interned.get(key := (cls, name or None, address))) is None:
+            contact = cls._interned.setdefault(key, cls(name=name, address=address))
+
+        return contact
 
 
 class Body:
     def __init__(self, text: str = None, html: str = None) -> None:
-        self.text, self.html = text.strip(), Html(html.strip())
+        self.text, self._html = text.strip(), html.strip()
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}(text={repr(self.text)})"
@@ -227,19 +378,35 @@ class Body:
     def _repr_html_(self) -> str:
         return str(self.html)
 
+    @cached_property
+    def html(self) -> Html:
+        """The html body, parsed only the first time it is accessed."""
+        return Html(self._html)
+
 
 class Attachments(BaseList):
     def save_to(self, folder: PathLike) -> list[File]:
+        folder = Dir.from_pathlike(folder)
         return [attachment.save_to(folder) for attachment in self]
 
 
 class Attachment:
-    def __init__(self, name: str, payload: str) -> None:
-        self.name, self.payload = name, payload
+    __slots__ = ("name", "_part")
+
+    def __init__(self, name: str, part: EmailMessage) -> None:
+        self.name, self._part = name, part
 
     def __repr__(self) -> str:
         return f"{type(self).__name__}(name={repr(self.name)})"
 
+    @property
+    def payload(self) -> str:
+        """The content of this attachment as a base64 string. Base64-encoded parts are returned as-is, without decoding them."""
+        if self._part.get("content-transfer-encoding", "").strip().lower() == "base64":
+            return self._part.get_payload()
+
+        return b64encode(self._part.get_payload(decode=True) or b"").decode()
+
     def save_to(self, folder: PathLike) -> File:
         return self._save(Dir.from_pathlike(folder).new_file(self.name))
 
@@ -247,5 +414,5 @@ class Attachment:
         return self._save(File.from_pathlike(file))
 
     def _save(self, file: PathLike) -> File:
-        (file := File.from_pathlike(file)).path.write_bytes(Base64.from_b64(self.payload).bytes)
+        (file := File.from_pathlike(file)).path.write_bytes(self._part.get_payload(decode=True) or b"")
         return file
@@ -1,19 +1,35 @@
 from __future__ import annotations
 
 import time
-from typing import Any, Callable, Collection, Union, TYPE_CHECKING, Optional
-
-from subtypes import Dict, List
-from miscutils import OneOrMany, Timer
+from collections import deque
+from itertools import islice
+from operator import attrgetter
+from typing import Any, Callable, Collection, Iterable, Iterator, Union, TYPE_CHECKING, Optional
 
 from .attribute import BaseAttributeMeta, BaseAttribute, Expression, OrderableAttributeMixin, Enums
 from .message import Message
+from .utils import as_list
 from .label import BaseLabel, Label, Category
 
 if TYPE_CHECKING:
+    from googleapiclient.http import HttpRequest
     from .gmail import Gmail
 
 
+class _Descending:
+    """Wraps a sort key so that it sorts in reverse, allowing ascending and descending keys to be combined into a single sort."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any) -> None:
+        self.value = value
+
+    def __eq__(self, other: _Descending) -> bool:
+        return self.value == other.value
+
+    def __lt__(self, other: _Descending) -> bool:
+        return other.value < self.value
+
+
 class Query:
     """A class for querying the api elements within a given collection."""
 
@@ -24,15 +40,19 @@ class Query:
         self._limit: Optional[int] = self._gmail.BATCH_SIZE or 25
         self._trash = False
         self._order: Optional[list[OrderableAttributeMixin]] = None
+        self._format = Message.Format.RAW
 
     def __repr__(self) -> str:
         labels = None if self._labels is None else [label.name for label in self._labels]
         order_by = None if self._order is None else [f"{order.attr} {order.direction}" for order in self._order]
-        return f"{type(self).__name__}(where={repr(self._where)}, labels={repr(labels)}, limit={self._limit}, include_trash={self._trash}, order_by={repr(order_by)})"
+        return f"{type(self).__name__}(where={repr(self._where)}, labels={repr(labels)}, limit={self._limit}, include_trash={self._trash}, order_by={repr(order_by)}, format={self._format.value})"
 
     def __call__(self) -> Any:
         return self.execute()
 
+    def __iter__(self) -> Iterator[Message]:
+        return self.iter_messages()
+
     @property
     def bulk(self) -> BulkAction:
         """Perform a bulk action on the resultset of this query."""
@@ -45,12 +65,12 @@ class Query:
 
     def labels(self, labels: Union[BaseLabel, Collection[BaseLabel]]) -> Query:
         """Set a label or list of labels (or categories) which the message must have."""
-        self._labels = OneOrMany(of_type=BaseLabel).to_list(labels)
+        self._labels = as_list(labels, of_type=BaseLabel)
         return self
 
     def order_by(self, order_clause: Union[OrderableAttributeMixin, Collection[OrderableAttributeMixin]]) -> Query:
         """Set the filter clause on this query. Accepts a single boolean attribute, boolean expression or boolean expression clause."""
-        self._order = OneOrMany(of_type=OrderableAttributeMixin).to_list(order_clause)
+        self._order = as_list(order_clause, of_type=OrderableAttributeMixin)
         return self
 
     def limit(self, limit: int = 25) -> Query:
@@ -63,20 +83,44 @@ class Query:
         self._trash = include_trash
         return self
 
+    def format(self, format_: Message.Format) -> Query:
+        """Set the format the resulting messages are fetched in. Use 'Message.Format.METADATA' when only the headers, labels and dates are needed."""
+        self._format = format_
+        return self
+
     def execute(self) -> list[Message]:
         """Execute this query and return the results."""
-        message_ids = List(self._fetch_message_ids())
-        if not self._gmail.BATCH_SIZE:
-            messages = [self._gmail.Constructors.Message.from_id(message_id=message_id, gmail=self._gmail) for message_id in message_ids]
-        else:
-            messages = sum([
-                self._fetch_messages_in_batch(sublist)
-                for sublist in message_ids.split_into_batches_of_size(self._gmail.BATCH_SIZE)
-            ], [])
+        return list(self.iter_messages())
 
-        return messages if self._order is None else self._apply_ordering_to_messages(messages)
+    def iter_messages(self) -> Iterator[Message]:
+        """Execute this query and yield the results as each batch of them arrives, fetching further pages of message ids only as they are needed. If an ordering has been set, all results must be fetched before the first is yielded."""
+        if self._order is None:
+            yield from self._iter_messages()
+        else:
+            yield from self._apply_ordering_to_messages(list(self._iter_messages()))
 
-    def _fetch_message_ids(self) -> list[int]:
+    def _iter_messages(self) -> Iterator[Message]:
+        message_ids = self._iter_message_ids()
+        if not self._gmail.BATCH_SIZE:
+            for message_id in message_ids:
+                yield self._gmail.Constructors.Message.from_id(message_id=message_id, gmail=self._gmail, format_=self._format)
+        else:
+            batches = iter(lambda: list(islice(message_ids, self._gmail.BATCH_SIZE)), [])
+            in_flight = deque()
+
+            try:
+                for batch in self._throttle(batches):
+                    in_flight.append(self._gmail._executor.submit(self._fetch_messages_in_batch, batch))
+                    if len(in_flight) >= self._gmail.BATCH_WORKERS:
+                        yield from in_flight.popleft().result()
+
+                while in_flight:
+                    yield from in_flight.popleft().result()
+            finally:
+                for future in in_flight:
+                    future.cancel()
+
+    def _iter_message_ids(self) -> Iterator[str]:
         kwargs = {
             key: val for key, val in
             {"q": self._where,
@@ -85,44 +129,45 @@ class Query:
              "includeSpamTrash": self._trash}.items()
             if val
         }
+        kwargs["fields"] = "messages/id,nextPageToken"
+
+        response, count = self._gmail._messages.list(userId="me", **kwargs).execute(), 0
+
+        while True:
+            for resource in (resources := response.get("messages", [])):
+                yield resource["id"]
+
+            count += len(resources)
 
-        response = Dict(self._gmail.service.users().messages().list(userId="me", **kwargs).execute())
-        resources = response.get("messages", [])
+            if "nextPageToken" not in response:
+                break
 
-        while "nextPageToken" in response:
             if self._limit is not None:
-                if remainder := (self._limit - len(resources)):
+                if remainder := (self._limit - count):
                     kwargs["maxResults"] = remainder
                 else:
                     break
 
-            response = Dict(self._gmail.service.users().messages().list(userId="me", pageToken=response.nextPageToken, **kwargs).execute())
-            resources += response.messages
-
-        return [resouce.id for resouce in resources]
-
-    def _fetch_messages_in_batch(self, message_ids: list[int]) -> list[Message]:
-        def append_to_list(response_id: str, response: dict, exception: Exception) -> None:
-            if exception is not None:
-                raise exception
-
-            resources.append(Dict(response))
+            response = self._gmail._messages.list(userId="me", pageToken=response["nextPageToken"], **kwargs).execute()
 
-        timer, resources, batch = Timer(), [], self._gmail.service.new_batch_http_request(callback=append_to_list)
-        for message_id in message_ids:
-            batch.add(self._gmail.service.users().messages().get(userId="me", id=message_id, format="raw"))
+    def _fetch_messages_in_batch(self, message_ids: list[str]) -> list[Message]:
+        return self._gmail.Constructors.Message.from_ids(message_ids=message_ids, gmail=self._gmail, format_=self._format)
 
-        batch.execute()
-        messages = [self._gmail.Constructors.Message(resource=resource, gmail=self._gmail) for resource in resources]
+    def _throttle(self, batches: Iterable[list[str]]) -> Iterator[list[str]]:
+        """Yield the given batches no more often than once every 'Gmail.BATCH_DELAY_SECONDS', to stay within the api's rate limits."""
+        for index, batch in enumerate(batches):
+            if index and self._gmail.BATCH_DELAY_SECONDS:
+                time.sleep(self._gmail.BATCH_DELAY_SECONDS)
 
-        if timer < self._gmail.BATCH_DELAY_SECONDS:
-            time.sleep(self._gmail.BATCH_DELAY_SECONDS - float(timer))
-
-        return messages
+            yield batch
 
     def _apply_ordering_to_messages(self, messages: list[Message]) -> list[Message]:
-        for attribute in reversed(self._order):
-            messages = sorted(messages, key=lambda msg: getattr(msg, attribute.attr), reverse=attribute.direction is Enums.Direction.DESCENDING)
+        keys = [(attribute.attr, attribute.direction is Enums.Direction.DESCENDING) for attribute in self._order]
+
+        if len(directions := {descending for _, descending in keys}) == 1:
+            messages.sort(key=attrgetter(*(attr for attr, _ in keys)), reverse=directions.pop())
+        else:
+            messages.sort(key=lambda msg: tuple(_Descending(getattr(msg, attr)) if descending else getattr(msg, attr) for attr, descending in keys))
 
         return messages
 
@@ -141,7 +186,7 @@ class BulkActionContext:
         return len(self) > 0
 
     def __enter__(self) -> BulkActionContext:
-        self.result_set = self._query._fetch_message_ids()
+        self._ensure_result_set()
         return self
 
     def __exit__(self, ex_type: Any, ex_value: Any, ex_traceback: Any) -> None:
@@ -153,11 +198,19 @@ class BulkActionContext:
         self._committed = True
 
     def execute(self) -> int:
-        """Perform the bulk action corresponding to this context."""
-        self.result_set = self._query._fetch_message_ids()
+        """Perform the bulk action corresponding to this context. The result set fetched on entering the context is reused, unless it has been invalidated since."""
+        self._ensure_result_set()
         self._action(self.result_set)
         return len(self)
 
+    def invalidate(self) -> None:
+        """Discard the current result set, so that it is fetched again the next time it is needed."""
+        self.result_set = None
+
+    def _ensure_result_set(self) -> None:
+        if self.result_set is None:
+            self.result_set = list(self._query._iter_message_ids())
+
 
 class BulkAction:
     """A class representing a bulk action performed on the resultset of a query."""
@@ -166,30 +219,45 @@ class BulkAction:
         self._query, self._gmail = query, query._gmail
 
     def delete(self) -> BulkActionContext:
-        return BulkActionContext(action=lambda results: self._gmail.service.users().messages().batchDelete(userId="me", body={"ids": results}), query=self._query)
+        return BulkActionContext(action=self._chunked_action(self._gmail._messages.batchDelete), query=self._query)
 
     def change_category_to(self, category: Category) -> BulkActionContext:
         if isinstance(category, self._gmail.Constructors.Category):
-            return BulkActionContext(action=lambda results: self._gmail.service.users().messages().batchModify(userId="me", body={"ids": results, "addLabelIds": [category.id]}), query=self._query)
+            return BulkActionContext(action=self._chunked_action(self._gmail._messages.batchModify, addLabelIds=[category.id]), query=self._query)
         else:
             raise TypeError(f"Argument to '{self.change_category_to.__name__}' must be of type '{self._gmail.Constructors.Category.__name__}', not '{type(category).__name__}'.")
 
     def add_labels(self, labels: Union[Label, Collection[Label]]) -> BulkActionContext:
-        label_ids = OneOrMany(of_type=self._gmail.Constructors.Label).to_list(labels)
-        return BulkActionContext(action=lambda results: self._gmail.service.users().messages().batchModify(userId="me", body={"ids": results, "addLabelIds": label_ids}), query=self._query)
+        label_ids = [label.id for label in as_list(labels, of_type=self._gmail.Constructors.Label)]
+        return BulkActionContext(action=self._chunked_action(self._gmail._messages.batchModify, addLabelIds=label_ids), query=self._query)
 
     def remove_labels(self, labels: Union[Label, Collection[Label]]) -> BulkActionContext:
-        label_ids = OneOrMany(of_type=self._gmail.Constructors.Label).to_list(labels)
-        return BulkActionContext(action=lambda results: self._gmail.service.users().messages().batchModify(userId="me", body={"ids": results, "removeLabelIds": label_ids}), query=self._query)
+        label_ids = [label.id for label in as_list(labels, of_type=self._gmail.Constructors.Label)]
+        return BulkActionContext(action=self._chunked_action(self._gmail._messages.batchModify, removeLabelIds=label_ids), query=self._query)
 
     def mark_is_read(self, is_read: bool = True) -> BulkActionContext:
-        return self.remove_labels(self._gmail.labels.UNREAD()) if is_read else self.add_labels(self._gmail.labels.UNREAD())
+        return self.remove_labels(self._gmail.labels.system.unread()) if is_read else self.add_labels(self._gmail.labels.system.unread())
 
     def mark_is_important(self, is_important: bool = True) -> BulkActionContext:
-        return self.add_labels(self._gmail.labels.IMPORTANT()) if is_important else self.remove_labels(self._gmail.labels.IMPORTANT())
+        return self.add_labels(self._gmail.labels.system.important()) if is_important else self.remove_labels(self._gmail.labels.system.important())
 
     def mark_is_starred(self, is_starred: bool = True) -> BulkActionContext:
-        return self.add_labels(self._gmail.labels.STARRED()) if is_starred else self.remove_labels(self._gmail.labels.STARRED())
+        return self.add_labels(self._gmail.labels.system.starred()) if is_starred else self.remove_labels(self._gmail.labels.system.starred())
 
     def archive(self) -> BulkActionContext:
-        return self.remove_labels(self._gmail.labels.INBOX())
+        return self.remove_labels(self._gmail.labels.system.inbox())
+
+    def _chunked_action(self, method: Callable[..., HttpRequest], **body: list[str]) -> Callable[[list[str]], None]:
+        """Return an action calling the given endpoint on the result set in chunks of up to 'Gmail.BATCH_MODIFY_SIZE' message ids, the most the api accepts in a single call. The chunks are sent together in batched requests."""
+        def action(results: list[str]) -> None:
+            size = self._gmail.BATCH_MODIFY_SIZE
+            requests = [method(userId="me", body={"ids": results[start:start + size], **body}) for start in range(0, len(results), size)]
+
+            if not self._gmail.BATCH_SIZE:
+                for request in requests:
+                    request.execute()
+            else:
+                for start in range(0, len(requests), self._gmail.BATCH_SIZE):
+                    self._gmail._execute_in_batch(requests[start:start + self._gmail.BATCH_SIZE])
+
+        return action
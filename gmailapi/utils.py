@@ -0,0 +1,17 @@
+from __future__ import annotations
+
+from typing import Any, Tuple, Union
+
+
+def as_list(candidate: Any, of_type: Union[type, Tuple[type, ...]]) -> list:
+    """Return the given object as a single-item list, or the given collection of objects as a list, raising TypeError if any of them is not of the given type(s)."""
+    if isinstance(candidate, of_type):
+        return [candidate]
+
+    items = list(candidate) if isinstance(candidate, (list, set, frozenset, tuple, dict)) else [candidate]
+
+    for item in items:
+        if not isinstance(item, of_type):
+            raise TypeError(f"Object: {repr(item)} has type '{type(item).__name__}'. Expected type(s): {of_type}.")
+
+    return items
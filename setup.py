@@ -26,6 +26,7 @@ setup(
     ],
     packages=find_packages(exclude=["tests*"]),
     install_requires=dependencies,
+    extras_require={"fast": ["orjson", "pybase64"]},
     setup_requires=['setuptools_scm'],
     include_package_data=True,
     author="Matt GdV",
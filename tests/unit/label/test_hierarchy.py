@@ -1,20 +1,37 @@
 # import pytest
+from types import SimpleNamespace
+
+from gmailapi.label.hierarchy import Node, Root
+from gmailapi.label.registry import Registry
 
 
 class TestRoot:
     def test_refresh(self):  # synced
         assert True
 
-    def test_register_children_recursively(self):  # synced
-        assert True
+    def test_register_children(self):
+        root, registry = Root(gmail=SimpleNamespace()), Registry()
+        root.register_children(labels=[{"id": "Label_1", "name": "A/B"}, {"id": "Label_2", "name": "A/B/C"}, {"id": "Label_3", "name": "X"}],
+                               old_registry=Registry(), new_registry=registry)
 
-    def test_regenerate_labels(self):  # synced
-        assert True
+        orphan = root.children["A/B"]
+        assert set(root.children) == {"A/B", "X"}
+        assert orphan.parent is None and orphan.name == "A/B"
+        assert orphan.children["C"].parent is orphan and registry.get_by_name("A/B/C") is orphan.children["C"]
 
+    def test_register_children_reuses_renamed_node(self):
+        root, old_registry, new_registry = Root(gmail=SimpleNamespace()), Registry(), Registry()
+        old_registry.set(node := Node(gmail=root.gmail, id_="Label_1", name="Old", parent=None))
 
-class TestNode:
-    def test_register_children_recursively(self):  # synced
-        assert True
+        root.register_children(labels=[{"id": "Label_1", "name": "New"}], old_registry=old_registry, new_registry=new_registry)
+
+        assert root.children == {"New": node}
+        assert node.name == "New" and node.resource == {"id": "Label_1", "name": "New"}
+        assert new_registry.get_by_name("New") is node and not new_registry.contains_by_name("Old")
 
     def test_regenerate_labels(self):  # synced
         assert True
+
+
+class TestNode:
+    pass
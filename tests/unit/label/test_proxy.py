@@ -1,8 +1,41 @@
 # import pytest
+from types import SimpleNamespace
+
+from gmailapi.label.proxy import LabelProxy
 
 
 class TestBaseProxy:
-    pass
+    def test___getattr__(self):  # synced
+        assert True
+
+    def test___iter__(self):  # synced
+        assert True
+
+    def test___len__(self):
+        parent = LabelProxy(SimpleNamespace(name="Work", entity=None))
+        assert len(parent) == 0
+
+        parent({"Some Thing": LabelProxy(SimpleNamespace(name="Work/Some Thing", entity=None)), "Other": LabelProxy(SimpleNamespace(name="Work/Other", entity=None))})
+        assert len(parent) == 2
+
+    def test___getitem__(self):
+        parent, child = LabelProxy(SimpleNamespace(name="Work", entity=None)), LabelProxy(SimpleNamespace(name="Work/Some Thing", entity=None))
+        parent({"Some Thing": child})
+
+        assert parent["Some Thing"] is child
+
+    def test___contains__(self):
+        parent = LabelProxy(SimpleNamespace(name="Work", entity=None))
+        parent({"Some Thing": LabelProxy(SimpleNamespace(name="Work/Some Thing", entity=None))})
+
+        assert "Some Thing" in parent
+        assert "Some_Thing" not in parent and "Work/Some Thing" not in parent
+
+    def test___dir__(self):  # synced
+        assert True
+
+    def test___call__(self):  # synced
+        assert True
 
 
 class TestLabelProxy:
@@ -30,6 +30,9 @@ class TestBaseAttributeMeta:
     def test__resolve(self):  # synced
         assert True
 
+    def test__check_value(self):  # synced
+        assert True
+
 
 class TestBooleanAttributeMeta:
     def test___invert__(self):  # synced
@@ -141,3 +144,6 @@ class TestExpression:
 
     def test__negate(self):  # synced
         assert True
+
+    def test_build(self):  # synced
+        assert True
@@ -1,4 +1,58 @@
-# import pytest
+import threading
+import time
+
+import pytest
+from googleapiclient.errors import HttpError
+from httplib2 import Response
+
+from gmailapi.gmail import Gmail, _BatchCollector
+
+
+def _http_error(status, reason):
+    return HttpError(Response({"status": status}), f'{{"error": {{"errors": [{{"reason": "{reason}"}}], "message": "{reason}"}}}}'.encode())
+
+
+class _FakeBatch:
+    def __init__(self, callback, outcomes, attempts):
+        self.callback, self.outcomes, self.attempts, self.requests = callback, outcomes, attempts, []
+
+    def add(self, request, request_id):
+        self.requests.append((request, request_id))
+
+    def execute(self, http=None):
+        self.attempts.append([request for request, _ in self.requests])
+        for request, request_id in self.requests:
+            outcome = self.outcomes[request].pop(0)
+            self.callback(request_id, None, outcome) if isinstance(outcome, Exception) else self.callback(request_id, outcome, None)
+
+
+def _fake_gmail(outcomes, max_retries=5):
+    gmail, attempts = Gmail.__new__(Gmail), []
+    gmail.BATCH_BACKOFF_SECONDS, gmail.BATCH_MAX_RETRIES = 0, max_retries
+    gmail._local, gmail._lock, gmail._backoff, gmail._next_batch_not_before = threading.local(), threading.Lock(), 0, time.monotonic()
+    gmail._local.http = object()
+    gmail.service = type("Service", (), {"new_batch_http_request": lambda self, callback: _FakeBatch(callback, outcomes, attempts)})()
+    return gmail, attempts
+
+
+class Test_JsonModel:
+    def test_deserialize(self):  # synced
+        assert True
+
+
+class Test_BatchCollector:
+    def test___call__(self):
+        collector = _BatchCollector(3)
+        collector("0", {"id": "a"}, None)
+        collector("2", None, _http_error(403, "rateLimitExceeded"))
+        assert collector.responses == [{"id": "a"}, None, None] and collector.rate_limited == [2]
+
+        with pytest.raises(HttpError):
+            collector("1", None, _http_error(404, "notFound"))
+
+        collector.retry = False
+        with pytest.raises(HttpError):
+            collector("1", None, _http_error(429, "rateLimitExceeded"))
 
 
 class TestGmail:
@@ -8,6 +62,15 @@ class TestGmail:
     def test___getitem__(self):  # synced
         assert True
 
+    def test___enter__(self):  # synced
+        assert True
+
+    def test___exit__(self):  # synced
+        assert True
+
+    def test_close(self):  # synced
+        assert True
+
     def test_draft(self):  # synced
         assert True
 
@@ -20,11 +83,68 @@ class TestGmail:
     def test_label_from_name(self):  # synced
         assert True
 
+    def test_batch_modify(self):  # synced
+        assert True
+
     def test__refresh_labels(self):  # synced
         assert True
 
+    def test__http(self):  # synced
+        assert True
+
+    def test__build_request(self):  # synced
+        assert True
+
+    def test__execute_requests(self):  # synced
+        assert True
+
+    def test__execute_in_batch(self):
+        gmail, attempts = _fake_gmail({"a": [{"id": "a"}], "b": [_http_error(403, "rateLimitExceeded"), {"id": "b"}], "c": [{"id": "c"}]})
+        gmail._backoff = 8
+
+        assert gmail._execute_in_batch(["a", "b", "c"]) == [{"id": "a"}, {"id": "b"}, {"id": "c"}]
+        assert attempts == [["a", "b", "c"], ["b"]] and gmail._backoff == 0
+
+    def test__execute_in_batch_gives_up_after_max_retries(self):
+        gmail, attempts = _fake_gmail({"a": [_http_error(429, "rateLimitExceeded")]*3}, max_retries=2)
+
+        with pytest.raises(HttpError):
+            gmail._execute_in_batch(["a"])
+
+        assert len(attempts) == 3
+
+    def test__back_off(self):
+        gmail, _ = _fake_gmail({})
+        gmail.BATCH_BACKOFF_SECONDS = 1
+
+        backoffs = []
+        for _ in range(7):
+            gmail._back_off()
+            backoffs.append(gmail._backoff)
+
+        assert backoffs == [1, 2, 4, 8, 16, 32, 32]
+
+    def test__is_rate_limit_error(self):
+        assert Gmail._is_rate_limit_error(_http_error(429, "rateLimitExceeded"))
+        assert Gmail._is_rate_limit_error(_http_error(403, "rateLimitExceeded"))
+        assert Gmail._is_rate_limit_error(_http_error(403, "userRateLimitExceeded"))
+        assert not Gmail._is_rate_limit_error(_http_error(403, "forbidden"))
+        assert not Gmail._is_rate_limit_error(ValueError("rateLimitExceeded"))
+
     def test__ensure_credentials_are_valid(self):  # synced
         assert True
 
+    def test__read_token(self):  # synced
+        assert True
+
+    def test__write_token(self):  # synced
+        assert True
+
+    def test__profile_cache(self):  # synced
+        assert True
+
+    def test__read_address(self):  # synced
+        assert True
+
     def test__request_credentials_json(self):  # synced
         assert True
@@ -14,12 +14,51 @@ class TestMessage:
     def test___contains__(self):  # synced
         assert True
 
+    def test_format(self):  # synced
+        assert True
+
+    def test_date(self):  # synced
+        assert True
+
+    def test_parsed(self):  # synced
+        assert True
+
+    def test_subject(self):  # synced
+        assert True
+
+    def test_from_(self):  # synced
+        assert True
+
+    def test_to(self):  # synced
+        assert True
+
+    def test_cc(self):  # synced
+        assert True
+
+    def test_bcc(self):  # synced
+        assert True
+
+    def test_body(self):  # synced
+        assert True
+
+    def test_attachments(self):  # synced
+        assert True
+
+    def test_labels(self):  # synced
+        assert True
+
+    def test_category(self):  # synced
+        assert True
+
     def test_render(self):  # synced
         assert True
 
     def test_change_category_to(self):  # synced
         assert True
 
+    def test_modify_labels(self):  # synced
+        assert True
+
     def test_add_labels(self):  # synced
         assert True
 
@@ -56,12 +95,42 @@ class TestMessage:
     def test_refresh(self):  # synced
         assert True
 
+    def test_refresh_many(self):  # synced
+        assert True
+
     def test__set_attributes_from_resource(self):  # synced
         assert True
 
+    def test__headers(self):  # synced
+        assert True
+
+    def test__parts(self):  # synced
+        assert True
+
+    def test__labels_and_category(self):  # synced
+        assert True
+
+    def test__set_label_ids(self):  # synced
+        assert True
+
+    def test__modify_labels(self):  # synced
+        assert True
+
+    def test__addresses(self):  # synced
+        assert True
+
     def test_from_id(self):  # synced
         assert True
 
+    def test_from_ids(self):  # synced
+        assert True
+
+    def test__request(self):  # synced
+        assert True
+
+    class TestFormat:
+        pass
+
     class TestAttribute:
         class TestFrom:
             pass
@@ -118,12 +187,18 @@ class TestContact:
     def test___eq__(self):  # synced
         assert True
 
+    def test___hash__(self):  # synced
+        assert True
+
     def test_or_none(self):  # synced
         assert True
 
     def test_many_or_none(self):  # synced
         assert True
 
+    def test__intern(self):  # synced
+        assert True
+
 
 class TestBody:
     def test___str__(self):  # synced
@@ -132,6 +207,9 @@ class TestBody:
     def test__repr_html_(self):  # synced
         assert True
 
+    def test_html(self):  # synced
+        assert True
+
 
 class TestAttachments:
     def test_save_to(self):  # synced
@@ -139,6 +217,9 @@ class TestAttachments:
 
 
 class TestAttachment:
+    def test_payload(self):  # synced
+        assert True
+
     def test_save_to(self):  # synced
         assert True
 
@@ -1,10 +1,28 @@
 # import pytest
+from types import SimpleNamespace
+
+from gmailapi.attribute import Enums
+from gmailapi.query import Query, _Descending
+
+
+class Test_Descending:
+    def test___eq__(self):
+        assert _Descending(1) == _Descending(1)
+        assert _Descending(1) != _Descending(2)
+
+    def test___lt__(self):
+        assert _Descending(2) < _Descending(1)
+        assert not _Descending(1) < _Descending(2)
+        assert sorted([("a", _Descending(1)), ("b", _Descending(3)), ("a", _Descending(2))]) == [("a", _Descending(2)), ("a", _Descending(1)), ("b", _Descending(3))]
 
 
 class TestQuery:
     def test___call__(self):  # synced
         assert True
 
+    def test___iter__(self):  # synced
+        assert True
+
     def test_bulk(self):  # synced
         assert True
 
@@ -23,10 +41,19 @@ class TestQuery:
     def test_include_trash(self):  # synced
         assert True
 
+    def test_format(self):  # synced
+        assert True
+
     def test_execute(self):  # synced
         assert True
 
-    def test__fetch_message_ids(self):  # synced
+    def test_iter_messages(self):  # synced
+        assert True
+
+    def test__iter_messages(self):  # synced
+        assert True
+
+    def test__iter_message_ids(self):  # synced
         assert True
 
     def test__fetch_messages_in_batch(self):  # synced
@@ -35,9 +62,19 @@ class TestQuery:
     def test_append_to_list(self):  # synced
         assert True
 
-    def test__apply_ordering_to_messages(self):  # synced
+    def test__throttle(self):  # synced
         assert True
 
+    def test__apply_ordering_to_messages(self):
+        query = Query.__new__(Query)
+        messages = [SimpleNamespace(sender=sender, date=date) for sender, date in [("b", 1), ("a", 1), ("b", 3), ("a", 2)]]
+
+        query._order = [SimpleNamespace(attr="sender", direction=Enums.Direction.ASCENDING), SimpleNamespace(attr="date", direction=Enums.Direction.DESCENDING)]
+        assert [(msg.sender, msg.date) for msg in query._apply_ordering_to_messages(list(messages))] == [("a", 2), ("a", 1), ("b", 3), ("b", 1)]
+
+        query._order = [SimpleNamespace(attr="sender", direction=Enums.Direction.DESCENDING), SimpleNamespace(attr="date", direction=Enums.Direction.DESCENDING)]
+        assert [(msg.sender, msg.date) for msg in query._apply_ordering_to_messages(list(messages))] == [("b", 3), ("b", 1), ("a", 2), ("a", 1)]
+
 
 class TestBulkActionContext:
     def test___len__(self):  # synced
@@ -52,6 +89,12 @@ class TestBulkActionContext:
     def test_execute(self):  # synced
         assert True
 
+    def test_invalidate(self):  # synced
+        assert True
+
+    def test__ensure_result_set(self):  # synced
+        assert True
+
 
 class TestBulkAction:
     def test_delete(self):  # synced
@@ -77,3 +120,6 @@ class TestBulkAction:
 
     def test_archive(self):  # synced
         assert True
+
+    def test__chunked_action(self):  # synced
+        assert True
@@ -0,0 +1,14 @@
+import pytest
+
+from gmailapi.utils import as_list
+
+
+def test_as_list():
+    assert as_list(1, of_type=int) == [1]
+    assert as_list((1, 2), of_type=int) == [1, 2]
+    assert sorted(as_list({1, 2}, of_type=int)) == [1, 2]
+    assert as_list({1: "a", 2: "b"}, of_type=int) == [1, 2]
+    assert as_list("ab", of_type=(int, str)) == ["ab"]
+
+    with pytest.raises(TypeError):
+        as_list([1, "a"], of_type=int)